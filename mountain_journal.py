@@ -18,61 +18,212 @@ Future Work:
 
 import json
 from datetime import datetime, timedelta
-import random
 import os
-import shutil  # For clearing all climbs
+from pathlib import Path
+import time
+
+try:
+    import orjson  # Faster JSON encode/decode when available
+except ImportError:
+    orjson = None
+
+# Buffer size for climb and journal entry files (the 8 KiB default is small for long climbs)
+BUF = 128 * 1024
+
+# Serialize a climb to bytes, preferring orjson
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+# Parse climb bytes, preferring orjson
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Write buffer reused for every serialized climb, footer, and entry
+_WBUF = bytearray()
+
+# Serialize obj (followed by end) into the shared write buffer
+def _serialize(obj, end=b""):
+    global _WBUF
+    if len(_WBUF) > BUF:
+        _WBUF = bytearray()  # Reallocate rather than hold on to an oversized buffer
+    _WBUF.clear()
+    _WBUF += _dumps(obj)
+    _WBUF += end
+    return _WBUF
+
+# Load a climb JSON file
+def _load_climb(path):
+    return _loads(Path(path).read_bytes())
+
+# Write data to path with low-level writes, replacing the file atomically once it is on disk
+def _atomic_write(path, data):
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]  # Small files are written in a single call
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+# Save a climb JSON file
+def _save_climb(path, climb):
+    _atomic_write(path, _serialize(climb))
+
+# Append one journal entry to the climb's JSON Lines entries file
+def _append_entry(climb_dir, entry):
+    with open(os.path.join(climb_dir, "entries.jsonl"), "ab", buffering=BUF) as f:
+        f.write(_serialize(entry, b"\n"))
+
+# Load the journal entries logged to the climb's JSON Lines entries file
+def _load_entries(climb_dir):
+    try:
+        with open(os.path.join(climb_dir, "entries.jsonl"), "rb", buffering=BUF) as f:
+            return [_loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+# Private generator for simulated GPS locations (not shared with other users of the random module),
+# created on first use so the random module is only imported when a location is needed
+_rng = None
 
 # Simulate GPS location
 def get_location():
-    return round(random.uniform(-90, 90), 6), round(random.uniform(-180, 180), 6)
-
-# Function to check if any climb is active (i.e., no 'end_time' in the file)
+    global _rng
+    if _rng is None:
+        import random
+        _rng = random.Random()
+    return round(_rng.uniform(-90, 90), 6), round(_rng.uniform(-180, 180), 6)
+
+# Sentinel file holding the path of the active climb file (empty when no climb is active)
+ACTIVE_FILE = os.path.join("app_data", ".active")
+
+# Active climb file path cached for this session (_UNKNOWN until first looked up)
+_UNKNOWN = object()
+_ACTIVE_PATH = _UNKNOWN
+
+# Record the active climb file path (or None) in the sentinel file and the session cache
+def _set_active_climb(climb_file):
+    global _ACTIVE_PATH
+    ensure_app_data_folder()
+    _atomic_write(ACTIVE_FILE, os.fsencode(climb_file or ""))
+    _ACTIVE_PATH = climb_file
+
+# Function to check if any climb is active, reading the sentinel file at most once per session
 def is_active_climb():
+    global _ACTIVE_PATH
+    if _ACTIVE_PATH is _UNKNOWN:
+        _ACTIVE_PATH = _read_active_climb()
+    return _ACTIVE_PATH
+
+# Read the active climb file path from the sentinel file
+def _read_active_climb():
+    try:
+        active_climb = os.fsdecode(Path(ACTIVE_FILE).read_bytes()).strip()
+    except FileNotFoundError:
+        # No sentinel yet: scan the climbs once and record the result
+        return _repair_active_climb()
+
+    if not active_climb:
+        return None
+    if not os.path.exists(active_climb):
+        # The recorded climb file is missing (moved, renamed, or never written); rescan the climbs
+        return _repair_active_climb()
+    if os.path.exists(os.path.join(os.path.dirname(active_climb), "climb_footer.json")):
+        # The active climb has already ended; drop the stale sentinel
+        _set_active_climb(None)
+        return None
+    return active_climb
+
+# Rebuild the sentinel file from a scan of the climbs
+def _repair_active_climb():
+    active_climb = _scan_active_climb()
+    if os.path.isdir("app_data"):
+        _set_active_climb(active_climb)
+    return active_climb
+
+# Function to find the active climb by scanning every climb (i.e., no footer and no 'end_time' in the file)
+def _scan_active_climb():
     app_data_path = "app_data"
-    for root, dirs, files in os.walk(app_data_path):
-        for file in files:
-            if file.endswith(".json"):
-                with open(os.path.join(root, file), "r") as f:
-                    climb = json.load(f)
-                    if "end_time" not in climb:
-                        return os.path.join(root, file)  # Return the full path of the active climb file
+    try:
+        climb_entries = os.scandir(app_data_path)
+    except FileNotFoundError:
+        return None
+    with climb_entries:
+        for climb_entry in climb_entries:
+            if not climb_entry.is_dir():
+                continue
+            # Climb files always live directly in the climb folder, never under journal_entries
+            climb_file = os.path.join(climb_entry.path, "climb_data.json")
+            try:
+                data = Path(climb_file).read_bytes()
+            except FileNotFoundError:
+                continue
+            # Climbs ended before the footer file existed store 'end_time' in the climb file itself.
+            # No user text is stored in the climb file, so a byte search avoids parsing it.
+            if b'"end_time"' in data or os.path.exists(os.path.join(climb_entry.path, "climb_footer.json")):
+                continue
+            return climb_file  # Return the full path of the active climb file (stop at the first match)
     return None
 
-# Ensure the app_data folder exists
+# Whether app_data is known to exist for this session
+_ensured = False
+
+# Ensure the app_data folder exists (checked on disk once per session)
 def ensure_app_data_folder():
-    if not os.path.exists("app_data"):
-        os.makedirs("app_data")
+    global _ensured
+    if _ensured:
+        return
+    os.makedirs("app_data", exist_ok=True)
+    _ensured = True
 
 # Function to create journal entry subfolders
 def create_journal_entry_folders(climb_dir):
     journal_entries_dir = os.path.join(climb_dir, "journal_entries")
-    os.makedirs(journal_entries_dir, exist_ok=True)
-    
-    # Create subfolders for text, audio, and images
-    os.makedirs(os.path.join(journal_entries_dir, "text"), exist_ok=True)
-    os.makedirs(os.path.join(journal_entries_dir, "audio"), exist_ok=True)
-    os.makedirs(os.path.join(journal_entries_dir, "images"), exist_ok=True)
+
+    # Create subfolders for text, audio, and images (journal_entries is created along with the first)
+    for subfolder in ("text", "audio", "images"):
+        os.makedirs(os.path.join(journal_entries_dir, subfolder), exist_ok=True)
 
 # Function to list all climbs in app_data
 def list_climbs():
     ensure_app_data_folder()  # Ensure app_data exists
-    climbs = os.listdir("app_data")
-    
-    if not climbs:
-        print("No climbs found.")
-        return
-    
     active_climb = is_active_climb()
-    
-    for climb in climbs:
-        if os.path.isdir(os.path.join("app_data", climb)):
-            if active_climb and climb in active_climb:
-                print(f"{climb} (active)")
+    active_name = os.path.basename(os.path.dirname(active_climb)) if active_climb else None
+
+    found = False
+    with os.scandir("app_data") as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            found = True
+            if entry.name == active_name:
+                print(f"{entry.name} (active)")
             else:
-                print(climb)
+                print(entry.name)
+
+    if not found:
+        print("No climbs found.")
+
+# Recursively delete a directory tree, using scandir's cached file types to avoid extra stats
+def _fast_rmtree(path):
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _fast_rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
 
 # Function to clear all climbs in app_data
 def clear_climbs():
+    global _ensured
     active_climb = is_active_climb()
 
     # Prevent clearing if there is an active climb
@@ -83,8 +234,10 @@ def clear_climbs():
     confirm = input("Are you sure you want to delete all climbs? This action cannot be undone. (yes/no): ").strip().lower()
     
     if confirm == "yes":
-        shutil.rmtree("app_data")
+        _fast_rmtree("app_data")
+        _ensured = False
         ensure_app_data_folder()  # Recreate the app_data folder after deletion
+        _set_active_climb(None)  # Reset the active climb sentinel
         print("All climbs have been cleared.")
     else:
         print("Operation cancelled. Climbs were not deleted.")
@@ -99,27 +252,31 @@ def get_climb_filename():
             print("Climb name cannot contain spaces. Please try again.")
             continue
 
-        # Check if a folder with the climb name exists, and handle numbering
-        original_name = climb_name
+        # Suffix the climb name with a timestamp so repeated names get their own folder
+        base_dir = os.path.join("app_data", f"{climb_name}_{int(time.time())}")
+        climb_dir = base_dir
         counter = 0
-        climb_dir = os.path.join("app_data", climb_name)
 
-        while os.path.exists(climb_dir):
-            counter += 1
-            climb_dir = os.path.join("app_data", f"{original_name}{counter}")
+        while True:
+            try:
+                os.makedirs(climb_dir, exist_ok=False)  # Create the climb directory
+                break
+            except FileExistsError:
+                # Same name reused within a second: handle duplicates with numbering
+                counter += 1
+                climb_dir = f"{base_dir}_{counter}"
 
-        os.makedirs(climb_dir)  # Create the climb directory
         create_journal_entry_folders(climb_dir)  # Create subfolders for journal entries
         return climb_dir  # Return the directory path
 
-# Function to start a new climb
+# Function to start a new climb, returning the new climb file path
 def start_climb():
     active_climb = is_active_climb()
     
     # Check if there is already an active climb
     if active_climb:
         print(f"A climb is already active: '{active_climb}'. Please end the current climb before starting a new one.")
-        return
+        return None
 
     # Get the climb directory
     climb_dir = get_climb_filename()
@@ -134,11 +291,13 @@ def start_climb():
     }
 
     # Save the climb data in a JSON file within the climb folder
+    # (recorded as active first, so a crash before the file is written is repaired by the next scan)
     climb_file = os.path.join(climb_dir, "climb_data.json")
-    with open(climb_file, "w") as f:
-        json.dump(climb, f)
+    _set_active_climb(climb_file)
+    _save_climb(climb_file, climb)
 
     print(f"Climb '{climb_dir}' started at {start_time}, location: {start_location}")
+    return climb_file
 
 # Generalized function to log a new journal entry (text, audio, image)
 def log_entry():
@@ -147,23 +306,21 @@ def log_entry():
     # If no active climb is found, automatically start a new one
     if not active_climb:
         print("No active climb found. Starting a new climb...")
-        start_climb()
-        active_climb = is_active_climb()  # After starting a climb, re-fetch the active climb
+        active_climb = start_climb()
 
     climb_dir = os.path.dirname(active_climb)
     journal_entries_dir = os.path.join(climb_dir, "journal_entries")
 
-    with open(active_climb, "r+") as f:
-        climb = json.load(f)
-
     entry_type = input("Entry type (text, audio, image): ").strip().lower()
-    entry_time = datetime.now().isoformat()
+    # Take the timestamp once: nanoseconds name the entry file (sortable and safe on every filesystem)
+    entry_ns = time.time_ns()
+    entry_time = datetime.fromtimestamp(entry_ns // 10**9).replace(microsecond=entry_ns // 1000 % 10**6).isoformat()
     entry_location = get_location()
 
     if entry_type == "text":
         entry_data = input("Journal entry (text): ")
-        entry_file = os.path.join(journal_entries_dir, "text", f"{entry_time}.txt")
-        with open(entry_file, "w") as file:
+        entry_file = os.path.join(journal_entries_dir, "text", f"{entry_ns}.txt")
+        with open(entry_file, "w", buffering=BUF) as file:
             file.write(entry_data)
 
         entry = {
@@ -175,8 +332,8 @@ def log_entry():
 
     elif entry_type == "audio":
         entry_data = input("Path to audio file (or placeholder): ")
-        entry_file = os.path.join(journal_entries_dir, "audio", f"{entry_time}.mp3")
-        with open(entry_file, "w") as file:
+        entry_file = os.path.join(journal_entries_dir, "audio", f"{entry_ns}.mp3")
+        with open(entry_file, "w", buffering=BUF) as file:
             file.write(entry_data)  # Placeholder for now
 
         entry = {
@@ -188,8 +345,8 @@ def log_entry():
 
     elif entry_type == "image":
         entry_data = input("Path to image file (or placeholder): ")
-        entry_file = os.path.join(journal_entries_dir, "images", f"{entry_time}.jpg")
-        with open(entry_file, "w") as file:
+        entry_file = os.path.join(journal_entries_dir, "images", f"{entry_ns}.jpg")
+        with open(entry_file, "w", buffering=BUF) as file:
             file.write(entry_data)  # Placeholder for now
 
         entry = {
@@ -203,10 +360,7 @@ def log_entry():
         print("Invalid entry type. Please choose 'text', 'audio', or 'image'.")
         return
 
-    climb["entries"].append(entry)
-
-    with open(active_climb, "w") as f:
-        json.dump(climb, f)
+    _append_entry(climb_dir, entry)
 
     print(f"{entry_type.capitalize()} entry logged at {entry_time}, location: {entry_location}")
 
@@ -243,7 +397,7 @@ def generate_climb_summary(climb_dir, climb):
 # Save the summary as a text file
 def save_climb_summary(climb_dir, summary):
     summary_file = os.path.join(climb_dir, "climb_summary.txt")
-    with open(summary_file, "w") as f:
+    with open(summary_file, "w", buffering=BUF) as f:
         f.write(summary)
     print(f"Climb summary saved as {summary_file}")
 
@@ -255,19 +409,24 @@ def end_climb():
         print("No active climb found to end.")
         return
 
-    with open(active_climb, "r+") as f:
-        climb = json.load(f)
+    climb_dir = os.path.dirname(active_climb)
 
     end_time = datetime.now().isoformat()
     end_location = get_location()
 
-    climb["end_time"] = end_time
-    climb["end_location"] = end_location
+    # Record the end of the climb in a footer file, leaving the climb file untouched
+    footer = {
+        "end_time": end_time,
+        "end_location": end_location
+    }
+    _save_climb(os.path.join(climb_dir, "climb_footer.json"), footer)
+    _set_active_climb(None)
 
-    with open(active_climb, "w") as f:
-        json.dump(climb, f)
+    # Assemble the full climb for the summary
+    climb = _load_climb(active_climb)
+    climb["entries"].extend(_load_entries(climb_dir))
+    climb.update(footer)
 
-    climb_dir = os.path.dirname(active_climb)
     print(f"Climb '{climb_dir}' ended at {end_time}, location: {end_location}")
 
     # Generate and save the climb summary
@@ -291,6 +450,16 @@ def exit_program():
         print("No active climb. Exiting the program.")
         exit()
 
+# Menu options mapped to their handlers
+_DISPATCH = {
+    "1": start_climb,
+    "2": log_entry,
+    "3": end_climb,
+    "4": list_climbs,
+    "5": clear_climbs,
+    "6": exit_program,
+}
+
 # Main CLI function
 def main():
     while True:
@@ -303,18 +472,9 @@ def main():
         print("6. Exit")
         choice = input("Choose an option: ")
 
-        if choice == "1":
-            start_climb()
-        elif choice == "2":
-            log_entry()
-        elif choice == "3":
-            end_climb()
-        elif choice == "4":
-            list_climbs()
-        elif choice == "5":
-            clear_climbs()
-        elif choice == "6":
-            exit_program()
+        handler = _DISPATCH.get(choice)
+        if handler:
+            handler()
         else:
             print("Invalid option. Try again.")
 